@@ -1,51 +1,261 @@
 import os
+import io
+import csv
+import math
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry  # You need to install tkcalendar: pip install tkcalendar
 
+try:
+    from numba import njit  # Optional: pip install numba
+except ImportError:
+    njit = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 EXPENSES_FILE = 'expenses.csv'
 INCOME_FILE = 'income.csv'
 EXPENSES_COLUMNS = ['date', 'category', 'amount', 'description']
 INCOME_COLUMNS = ['date', 'source', 'amount', 'description']
+DATE_FORMAT = '%Y-%m-%d'
 
 CATEGORIES = ['Food', 'Transport', 'Utilities', 'Entertainment', 'Health', 'Other']
 INCOME_SOURCES = ['Salary', 'Business', 'Investment', 'Gift', 'Other']
+YEAR_VALUES = tuple(str(y) for y in range(2000, datetime.now().year + 1))
+MONTH_VALUES = tuple(str(m) for m in range(1, 13))
+
+VALID_CATEGORIES = frozenset(CATEGORIES)
+VALID_INCOME_SOURCES = frozenset(INCOME_SOURCES)
+CATEGORY_CODES = {cat: code for code, cat in enumerate(CATEGORIES)}
+# Rows whose category is not in CATEGORIES (hand edits, renamed categories) are
+# reported under one extra bucket instead of being dropped.
+UNKNOWN_CATEGORY = 'Uncategorized'
+REPORT_CATEGORIES = CATEGORIES + [UNKNOWN_CATEGORY]
+SOURCE_CODES = {source: code for code, source in enumerate(INCOME_SOURCES)}
+
+EXPENSES_DTYPES = {'category': pd.CategoricalDtype(CATEGORIES), 'amount': np.float64, 'description': 'string'}
+INCOME_DTYPES = {'source': pd.CategoricalDtype(INCOME_SOURCES), 'amount': np.float64, 'description': 'string'}
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB, drained once when the file is closed
+REPORT_POLL_MS = 20
+
+def month_key(year, month):
+    return year * 100 + month
+
+def read_data_file(path, dtypes, st):
+    options = dict(parse_dates=['date'], date_format=DATE_FORMAT, cache_dates=True, dtype=dtypes)
+    # The CSV stays the source of truth (rows are appended to it); the typed Parquet copy
+    # records the CSV size and mtime it was built from and is only reused while both match.
+    # The cache is best-effort: any error reading or writing it falls back to the CSV.
+    cache = os.path.splitext(path)[0] + '.parquet'
+    # The amount dtype is part of the key so caches written with float32 amounts are rebuilt.
+    source = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'amount': np.dtype(dtypes['amount']).name}
+    try:
+        if os.path.exists(cache):
+            df = pd.read_parquet(cache)
+            if df.attrs.get('source') == source:
+                return df
+    except Exception as e:
+        logging.warning(f"Ignoring Parquet cache {cache}: {e}")
+    # Only the st_size bytes that existed at the stat are parsed; the file is append-only,
+    # and rows written after that are held by the caller.
+    with open(path, 'rb') as f:
+        data = io.BytesIO(f.read(st.st_size))
+    try:
+        # The multithreaded pyarrow parser is much faster on long histories (pip install pyarrow).
+        df = pd.read_csv(data, engine='pyarrow', **options)
+    except ImportError:
+        data.seek(0)
+        return pd.read_csv(data, **options)
+    try:
+        df.attrs['source'] = source
+        df.to_parquet(cache, index=False)
+    except Exception as e:
+        logging.warning(f"Could not write Parquet cache {cache}: {e}")
+    return df
+
+def add_month_key(df):
+    # Header-only files load 'date' as object, so normalise it before using .dt.
+    dates = df['date'] = pd.to_datetime(df['date'])
+    # Rows with a blank date (NaT) get key 0, which never matches a report month.
+    df['ym'] = month_key(dates.dt.year, dates.dt.month).fillna(0).astype('int32')
+    return df
+
+# Per-category expense totals and row counts for one month.
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def monthly_category_totals(ym, cat_code, amount, target_ym, n_cat):
+        totals = np.zeros(n_cat, dtype=np.float64)
+        counts = np.zeros(n_cat, dtype=np.int64)
+        for i in range(ym.shape[0]):
+            code = cat_code[i]
+            if ym[i] == target_ym and code >= 0:
+                totals[code] += amount[i]
+                counts[code] += 1
+        return totals, counts
+else:
+    def monthly_category_totals(ym, cat_code, amount, target_ym, n_cat):
+        mask = (ym == target_ym) & (cat_code >= 0)
+        return (np.bincount(cat_code[mask], weights=amount[mask], minlength=n_cat),
+                np.bincount(cat_code[mask], minlength=n_cat))
+
+def warm_up_jit():
+    # One call on dummy arrays with the loaded column dtypes compiles (or loads the cached) kernel.
+    monthly_category_totals(np.zeros(1, np.int32), np.zeros(1, np.int8), np.zeros(1, np.float64), 0, len(REPORT_CATEGORIES))
+
+# One append-only CSV (expenses or income) and its lazily loaded in-memory frame.
+class Ledger:
+    def __init__(self, path, columns, dtypes, codes, name):
+        self.path = path
+        self.columns = columns
+        self.dtypes = dtypes
+        self.codes = codes
+        self.name = name
+        self.key = columns[1]
+        # Code given to rows whose key is missing from codes (read back as NaN).
+        self.unknown_code = len(codes)
+        self.frame_columns = columns + ['ym', 'code']
+        self.frame_dtypes = {**dtypes, 'ym': 'int32', 'code': 'int8'}
+        # Reports read the frame on a worker thread while inserts happen on the Tk thread.
+        # _lock guards the state below and CSV appends and is only held briefly;
+        # _load_lock keeps to one loader and is held while parsing, without _lock.
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # The CSV is only read on first access, so add-only sessions never parse it.
+        self._df = None
+        self._loading = False
+        # Rows added since the frame was loaded (or while it loads), turned into one
+        # DataFrame on the next read.
+        self._pending = []
+        # Running amount total, populated on load and bumped on every insert after that.
+        self._total = 0.0
+        self._dates_sorted = True
+        self._last_date = None
+        self.create_if_missing()
+
+    def create_if_missing(self):
+        if not os.path.exists(self.path):
+            with open(self.path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(','.join(self.columns) + '\n')
+            logging.info(f"Created new {self.name} file.")
+
+    @property
+    def df(self):
+        # The returned frame is never modified in place, so callers can use it without the lock.
+        self.ensure_loaded()
+        with self._lock:
+            if self._pending:
+                new_rows = pd.DataFrame(self._pending, columns=self.frame_columns).astype(self.frame_dtypes)
+                self._df = pd.concat([self._df, new_rows], ignore_index=True)
+                self._pending.clear()
+            return self._df
+
+    @property
+    def total(self):
+        self.ensure_loaded()
+        return self._total
+
+    def ensure_loaded(self):
+        if self._df is None:
+            with self._load_lock:
+                if self._df is None:
+                    self.load()
+
+    def load(self):
+        # From the stat on, appended rows go to _pending, so the parse sees a fixed prefix.
+        with self._lock:
+            st = os.stat(self.path)
+            self._loading = True
+        try:
+            df = self.read_frame(st)
+        except Exception:
+            with self._lock:
+                # Those rows are in the CSV and will be read by the next load.
+                self._pending.clear()
+                self._loading = False
+            raise
+        with self._lock:
+            dates_sorted = df['date'].is_monotonic_increasing
+            last_date = df['date'].iat[-1] if len(df) else None
+            for row in self._pending:
+                if last_date is not None and row[0] < last_date:
+                    dates_sorted = False
+                last_date = row[0]
+            self._df = df
+            self._total = float(df['amount'].sum()) + sum(row[2] for row in self._pending)
+            self._dates_sorted = dates_sorted
+            self._last_date = last_date
+            self._loading = False
+        logging.info(f"Loaded {self.name} data.")
+
+    def read_frame(self, st):
+        df = read_data_file(self.path, self.dtypes, st)
+        add_month_key(df)
+        codes = df[self.key].cat.codes
+        unknown = codes < 0
+        if unknown.any():
+            logging.warning(f"{int(unknown.sum())} {self.name} rows have an unknown {self.key}; "
+                            f"they are counted under '{UNKNOWN_CATEGORY}'.")
+            codes = codes.mask(unknown, self.unknown_code).astype('int8')
+        df['code'] = codes
+        return df
+
+    def append(self, date, key, amount, description):
+        row = (date, key, amount, description, month_key(date.year, date.month), self.codes[key])
+        with self._lock:
+            with open(self.path, 'a', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+                csv.writer(f).writerow([date.strftime(DATE_FORMAT), key, amount, description])
+            # A running load picks these rows up when it finishes.
+            if self._loading:
+                self._pending.append(row)
+            # Without a loaded frame there is nothing to update; the next load reads the row back.
+            elif self._df is not None:
+                if self._last_date is not None and date < self._last_date:
+                    self._dates_sorted = False
+                self._last_date = date
+                self._pending.append(row)
+                self._total += amount
+        return row
+
+    def month_rows(self, year, month):
+        # With sorted dates two binary searches find the month; otherwise every row is
+        # returned and the caller filters on the 'ym' key.
+        df = self.df
+        if not self._dates_sorted:
+            return df
+        start = np.datetime64(f'{year:04d}-{month:02d}', 'M')
+        lo, hi = np.searchsorted(df['date'].to_numpy(), [start, start + 1])
+        return df.iloc[lo:hi]
 
 class FinanceTracker:
     def __init__(self):
-        self.expenses_df = pd.DataFrame(columns=EXPENSES_COLUMNS)
-        self.income_df = pd.DataFrame(columns=INCOME_COLUMNS)
-        self.load_data()
-
-    def load_data(self):
-        if os.path.exists(EXPENSES_FILE):
-            self.expenses_df = pd.read_csv(EXPENSES_FILE, parse_dates=['date'])
-            logging.info("Loaded expenses data.")
-        else:
-            self.expenses_df.to_csv(EXPENSES_FILE, index=False)
-            logging.info("Created new expenses file.")
+        self.expenses = Ledger(EXPENSES_FILE, EXPENSES_COLUMNS, EXPENSES_DTYPES, CATEGORY_CODES, 'expenses')
+        self.income = Ledger(INCOME_FILE, INCOME_COLUMNS, INCOME_DTYPES, SOURCE_CODES, 'income')
 
-        if os.path.exists(INCOME_FILE):
-            self.income_df = pd.read_csv(INCOME_FILE, parse_dates=['date'])
-            logging.info("Loaded income data.")
-        else:
-            self.income_df.to_csv(INCOME_FILE, index=False)
-            logging.info("Created new income file.")
+    @property
+    def expenses_df(self):
+        return self.expenses.df
+
+    @property
+    def income_df(self):
+        return self.income.df
 
     def save_expense(self, date, category, amount, description):
         try:
             amount = -abs(float(amount))
-            date = pd.to_datetime(date)
-            if category not in CATEGORIES:
+            if not math.isfinite(amount):
+                raise ValueError("Amount must be a finite number.")
+            if not isinstance(date, datetime):
+                date = pd.Timestamp(date)
+            if category not in VALID_CATEGORIES:
                 raise ValueError(f"Category '{category}' is not valid.")
-            new_row = {'date': date, 'category': category, 'amount': amount, 'description': description}
-            self.expenses_df = pd.concat([self.expenses_df, pd.DataFrame([new_row])], ignore_index=True)
-            self.expenses_df.to_csv(EXPENSES_FILE, index=False)
+            new_row = self.expenses.append(date, category, amount, description)
             logging.info(f"Added expense: {new_row}")
             return True, "Expense added successfully."
         except Exception as e:
@@ -55,12 +265,13 @@ class FinanceTracker:
     def save_income(self, date, source, amount, description):
         try:
             amount = abs(float(amount))
-            date = pd.to_datetime(date)
-            if source not in INCOME_SOURCES:
+            if not math.isfinite(amount):
+                raise ValueError("Amount must be a finite number.")
+            if not isinstance(date, datetime):
+                date = pd.Timestamp(date)
+            if source not in VALID_INCOME_SOURCES:
                 raise ValueError(f"Source '{source}' is not valid.")
-            new_row = {'date': date, 'source': source, 'amount': amount, 'description': description}
-            self.income_df = pd.concat([self.income_df, pd.DataFrame([new_row])], ignore_index=True)
-            self.income_df.to_csv(INCOME_FILE, index=False)
+            new_row = self.income.append(date, source, amount, description)
             logging.info(f"Added income: {new_row}")
             return True, "Income added successfully."
         except Exception as e:
@@ -68,37 +279,41 @@ class FinanceTracker:
             return False, str(e)
 
     def get_summary(self):
-        total_income = self.income_df['amount'].sum()
-        total_expenses = self.expenses_df['amount'].sum()
+        total_income = self.income.total
+        total_expenses = self.expenses.total
         balance = total_income + total_expenses
+        # Expenses are stored negative; + 0.0 turns an empty -0.0 back into 0.0.
+        total_expenses = -total_expenses + 0.0
         summary = (
             f"Total Income: ${total_income:.2f}\n"
-            f"Total Expenses: ${-total_expenses:.2f}\n"
+            f"Total Expenses: ${total_expenses:.2f}\n"
             f"Remaining Balance: ${balance:.2f}"
         )
         logging.info("Generated summary report.")
         return summary
 
     def get_monthly_report(self, year, month):
-        expenses_month = self.expenses_df[
-            (self.expenses_df['date'].dt.year == year) & (self.expenses_df['date'].dt.month == month)
-        ]
-        income_month = self.income_df[
-            (self.income_df['date'].dt.year == year) & (self.income_df['date'].dt.month == month)
-        ]
-        total_expenses = expenses_month['amount'].sum()
+        ym = month_key(year, month)
+        # month_rows only locks to take a snapshot of the frame; the aggregation runs unlocked.
+        expenses_month = self.expenses.month_rows(year, month)
+        totals, counts = monthly_category_totals(
+            expenses_month['ym'].to_numpy(), expenses_month['code'].to_numpy(),
+            expenses_month['amount'].to_numpy(), ym, len(REPORT_CATEGORIES))
+        income_month = self.income.month_rows(year, month)
+        income_month = income_month[income_month['ym'] == ym]
+        total_expenses = totals.sum()
         total_income = income_month['amount'].sum()
         balance = total_income + total_expenses
-        report = (
+        total_expenses = -total_expenses + 0.0
+        header = (
             f"Monthly Report for {year}-{month:02d}\n"
             f"Total Income: ${total_income:.2f}\n"
-            f"Total Expenses: ${-total_expenses:.2f}\n"
+            f"Total Expenses: ${total_expenses:.2f}\n"
             f"Balance: ${balance:.2f}\n\n"
             "Expenses by Category:\n"
         )
-        category_summary = expenses_month.groupby('category')['amount'].sum().abs()
-        for cat, amt in category_summary.items():
-            report += f"  {cat}: ${amt:.2f}\n"
+        lines = [f"  {cat}: ${amt:.2f}\n" for cat, amt, count in zip(REPORT_CATEGORIES, np.abs(totals), counts) if count]
+        report = header + ''.join(lines)
         logging.info(f"Generated monthly report for {year}-{month:02d}.")
         return report
 
@@ -109,7 +324,7 @@ class FinanceTracker:
             title="Save Report As"
         )
         if file_path:
-            with open(file_path, 'w') as f:
+            with open(file_path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
                 f.write(text)
             logging.info(f"Report exported to {file_path}")
             messagebox.showinfo("Export Successful", f"Report saved to {file_path}")
@@ -120,6 +335,9 @@ class FinanceApp(tk.Tk):
         self.title("Advanced Expense Tracker")
         self.geometry("600x600")
         self.tracker = tracker
+        self.report_executor = ThreadPoolExecutor(max_workers=1)
+        if njit is not None:
+            threading.Thread(target=warm_up_jit, daemon=True).start()
         self.create_widgets()
 
     def create_widgets(self):
@@ -181,16 +399,17 @@ class FinanceApp(tk.Tk):
 
     def create_report_tab(self):
         frame = self.report_tab
+        now = datetime.now()
         ttk.Button(frame, text="Show Summary", command=self.show_summary).pack(pady=10)
 
         ttk.Label(frame, text="Monthly Report Year:").pack(pady=5)
-        self.report_year = ttk.Combobox(frame, values=[str(y) for y in range(2000, datetime.now().year + 1)], state='readonly')
-        self.report_year.set(str(datetime.now().year))
+        self.report_year = ttk.Combobox(frame, values=YEAR_VALUES, state='readonly')
+        self.report_year.set(str(now.year))
         self.report_year.pack()
 
         ttk.Label(frame, text="Monthly Report Month:").pack(pady=5)
-        self.report_month = ttk.Combobox(frame, values=[str(m) for m in range(1, 13)], state='readonly')
-        self.report_month.set(str(datetime.now().month))
+        self.report_month = ttk.Combobox(frame, values=MONTH_VALUES, state='readonly')
+        self.report_month.set(str(now.month))
         self.report_month.pack()
 
         ttk.Button(frame, text="Show Monthly Report", command=self.show_monthly_report).pack(pady=10)
@@ -235,11 +454,24 @@ class FinanceApp(tk.Tk):
         try:
             year = int(self.report_year.get())
             month = int(self.report_month.get())
-            report = self.tracker.get_monthly_report(year, month)
-            self.report_text.delete(1.0, tk.END)
-            self.report_text.insert(tk.END, report)
         except Exception as e:
             messagebox.showerror("Error", f"Invalid year or month: {e}")
+            return
+        # Build the report off the Tk thread and poll for it, so the window stays responsive.
+        future = self.report_executor.submit(self.tracker.get_monthly_report, year, month)
+        self.after(REPORT_POLL_MS, self.poll_monthly_report, future)
+
+    def poll_monthly_report(self, future):
+        if not future.done():
+            self.after(REPORT_POLL_MS, self.poll_monthly_report, future)
+            return
+        try:
+            report = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not build report: {e}")
+            return
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(tk.END, report)
 
     def export_report(self):
         text = self.report_text.get(1.0, tk.END).strip()
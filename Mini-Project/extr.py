@@ -12,34 +12,75 @@ Features:
 - Save/load data to JSON (tracker_data.json)
 - Export CSV
 
-This is a simple, self-contained app without external dependencies.
+This is a simple, self-contained app without external dependencies
+(orjson is used for faster JSON and numpy for loading long histories when
+installed: pip install orjson numpy).
 """
 
+import csv
 import json
+import math
 import os
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
+
+try:
+    import orjson  # Optional: pip install orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # Optional: pip install numpy
+except ImportError:
+    np = None
 
 DATA_FILE = "tracker_data.json"
 DATE_FORMAT = "%Y-%m-%d"
 
+# Bulk entry repeats the same date string; invalid strings raise and are not cached.
+@lru_cache(maxsize=256)
+def parse_date(s: str) -> datetime:
+    return datetime.strptime(s, DATE_FORMAT)
+
+# ---------------- JSON helpers -----------------
+def read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Autosaves are machine-read, so they are compact; pretty=True is for exported snapshots.
+def write_json(path: str, data: Any, pretty: bool = False):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(",", ":"))
+
 # ---------------- Data classes -----------------
-@dataclass
+@dataclass(slots=True)
 class Person:
     name: str
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     date: str
     description: str
     amount: float
     payer: str
-    participants: List[str]
+    participants: Tuple[str, ...]
 
-@dataclass
+@dataclass(slots=True)
 class Income:
     date: str
     description: str
@@ -53,6 +94,25 @@ class Storage:
         self.people: List[Person] = []
         self.expenses: List[Expense] = []
         self.incomes: List[Income] = []
+        # kept in sync with self.people for O(1) name checks
+        self._people_names: set = set()
+        # casefolded name -> number of people with it; files from before the
+        # case-insensitive check can hold both "Ann" and "ann"
+        self._name_keys: Dict[str, int] = {}
+        # one shared tuple per distinct participant group
+        self._participant_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        # person -> {id(record): record} for the expenses/incomes they appear in
+        self._expenses_by_person: Dict[str, Dict[int, Expense]] = {}
+        self._incomes_by_recipient: Dict[str, Dict[int, Income]] = {}
+        self._names_cache: List[str] = []
+        # bumped whenever the set of people changes
+        self._people_rev = 0
+        # running per-person balances, updated on every add/remove
+        self._balances: Dict[str, float] = {}
+        # bumped whenever _balances changes, so views can skip redundant redraws
+        self._balances_version = 0
+        # cleared inside bulk() so a batch of edits is written once
+        self._autosave = True
         self.load()
 
     def load(self):
@@ -60,13 +120,30 @@ class Storage:
             self.save()
             return
         try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.filename)
         except Exception:
             data = {}
-        self.people = [Person(**p) for p in data.get("people", [])]
-        self.expenses = [Expense(**e) for e in data.get("expenses", [])]
-        self.incomes = [Income(**i) for i in data.get("incomes", [])]
+        # positional construction skips the **kwargs unpacking per record
+        self.people = [Person(p["name"]) for p in data.get("people", ())]
+        self._names_cache = [p.name for p in self.people]
+        self._people_names = set(self._names_cache)
+        self._name_keys = {}
+        for name in self._names_cache:
+            key = name.casefold()
+            self._name_keys[key] = self._name_keys.get(key, 0) + 1
+        self._people_rev += 1
+        intern = self._intern_participants
+        self.expenses = [Expense(e["date"], e["description"], e["amount"], e["payer"], intern(e["participants"]))
+                         for e in data.get("expenses", ())]
+        self.incomes = [Income(i["date"], i["description"], i["amount"], i["recipient"])
+                        for i in data.get("incomes", ())]
+        self._expenses_by_person = {}
+        self._incomes_by_recipient = {}
+        for exp in self.expenses:
+            self._index_expense(exp)
+        for inc in self.incomes:
+            self._index_income(inc)
+        self._rebuild_balances()
 
     def save(self):
         data = {
@@ -74,77 +151,242 @@ class Storage:
             "expenses": [asdict(e) for e in self.expenses],
             "incomes": [asdict(i) for i in self.incomes],
         }
-        with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        write_json(self.filename, data)
+
+    # with storage.bulk(): ... -- edits inside the block are saved once on exit
+    @contextmanager
+    def bulk(self):
+        previous = self._autosave
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = previous
+            if previous:
+                self.save()
+
+    def _rebuild_balances(self):
+        if np is not None:
+            self._balances = self._balances_array()
+            self._balances_version += 1
+            return
+        # one full pass; names are bound locally since this runs once per row on large files
+        balances = {p.name: 0.0 for p in self.people}
+        for e in self.expenses:
+            parts = e.participants
+            num = len(parts)
+            if num == 0:
+                continue
+            amount = e.amount
+            share = amount / num
+            for part in parts:
+                balances[part] -= share
+            balances[e.payer] += amount
+        for inc in self.incomes:
+            balances[inc.recipient] += inc.amount
+        self._balances = balances
+        self._balances_version += 1
+
+    def _balances_array(self) -> Dict[str, float]:
+        # Column (SoA) view of the records: amounts, payer/recipient indices and a flat
+        # participant index list, summed per person with np.bincount.
+        names = self._names_cache
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        exps = self.expenses
+        amounts = np.fromiter((e.amount for e in exps), np.float64, len(exps))
+        counts = np.fromiter((len(e.participants) for e in exps), np.intp, len(exps))
+        payer_idx = np.fromiter((index[e.payer] for e in exps), np.intp, len(exps))
+        part_cols = np.fromiter((index[p] for e in exps for p in e.participants), np.intp, int(counts.sum()))
+        part_rows = np.repeat(np.arange(len(exps)), counts)
+        # expenses without participants are skipped entirely, payer included
+        paid = np.where(counts > 0, amounts, 0.0)
+        shares = paid / np.maximum(counts, 1)
+        # bincount of an empty array is int64, so accumulate into a float array
+        bal = np.zeros(n)
+        bal += np.bincount(payer_idx, weights=paid, minlength=n)
+        bal -= np.bincount(part_cols, weights=shares[part_rows], minlength=n)
+        incs = self.incomes
+        recipient_idx = np.fromiter((index[i.recipient] for i in incs), np.intp, len(incs))
+        bal += np.bincount(recipient_idx, weights=np.fromiter((i.amount for i in incs), np.float64, len(incs)), minlength=n)
+        return dict(zip(names, bal.tolist()))
+
+    def _intern_participants(self, participants: Sequence[str]) -> Tuple[str, ...]:
+        parts = tuple(participants)
+        return self._participant_tuples.setdefault(parts, parts)
+
+    # reverse indices used by remove_person
+    def _index_expense(self, e: Expense):
+        for name in {e.payer, *e.participants}:
+            self._expenses_by_person.setdefault(name, {})[id(e)] = e
+
+    def _unindex_expense(self, e: Expense):
+        for name in {e.payer, *e.participants}:
+            self._expenses_by_person.get(name, {}).pop(id(e), None)
+
+    def _index_income(self, i: Income):
+        self._incomes_by_recipient.setdefault(i.recipient, {})[id(i)] = i
+
+    def _unindex_income(self, i: Income):
+        self._incomes_by_recipient.get(i.recipient, {}).pop(id(i), None)
+
+    # Adding a record applies its deltas; removing one rebuilds the affected balances
+    # from the reverse indices, so undoing leaves no float residue behind.
+    def _apply_expense(self, e: Expense):
+        num = len(e.participants)
+        if num == 0:
+            return
+        balances = self._balances
+        amount = e.amount
+        share = amount / num
+        self._balances_version += 1
+        # each participant owes share
+        for part in e.participants:
+            balances[part] -= share
+        # payer paid full amount
+        balances[e.payer] += amount
+
+    def _apply_income(self, i: Income):
+        self._balances[i.recipient] += i.amount
+        self._balances_version += 1
+
+    def _recompute_balance(self, name: str):
+        # same order and arithmetic as a full rebuild, over this person's records only
+        balance = 0.0
+        for e in self._expenses_by_person.get(name, {}).values():
+            num = len(e.participants)
+            if num == 0:
+                continue
+            share = e.amount / num
+            for part in e.participants:
+                if part == name:
+                    balance -= share
+            if e.payer == name:
+                balance += e.amount
+        for i in self._incomes_by_recipient.get(name, {}).values():
+            balance += i.amount
+        self._balances[name] = balance
+        self._balances_version += 1
 
     # helpers
+    def names(self) -> List[str]:
+        return self._names_cache
+
+    def balances(self) -> Dict[str, float]:
+        return self._balances
+
+    @property
+    def people_rev(self) -> int:
+        return self._people_rev
+
+    @property
+    def balances_version(self) -> int:
+        return self._balances_version
+
     def add_person(self, name: str):
-        if any(p.name == name for p in self.people):
+        key = name.casefold()
+        if key in self._name_keys:
             raise ValueError("Person already exists")
         self.people.append(Person(name=name))
-        self.save()
+        self._people_names.add(name)
+        self._name_keys[key] = 1
+        self._people_rev += 1
+        self._names_cache = [p.name for p in self.people]
+        self._balances[name] = 0.0
+        self._balances_version += 1
+        if self._autosave:
+            self.save()
 
     def remove_person(self, name: str):
         self.people = [p for p in self.people if p.name != name]
-        # also remove from expenses/incomes where relevant
-        self.expenses = [e for e in self.expenses if e.payer != name and name not in e.participants]
-        self.incomes = [i for i in self.incomes if i.recipient != name]
-        self.save()
+        if name in self._people_names:
+            self._people_names.discard(name)
+            key = name.casefold()
+            if self._name_keys[key] > 1:
+                self._name_keys[key] -= 1
+            else:
+                del self._name_keys[key]
+        self._people_rev += 1
+        self._names_cache = [p.name for p in self.people]
+        # also remove from expenses/incomes where relevant; the reverse indices
+        # give the affected rows directly, so untouched lists are not rescanned
+        dropped_expenses = self._expenses_by_person.pop(name, {})
+        if dropped_expenses:
+            affected = set()
+            for e in dropped_expenses.values():
+                self._unindex_expense(e)
+                affected.update((e.payer, *e.participants))
+            affected.discard(name)
+            for person in affected:
+                self._recompute_balance(person)
+            self.expenses = [e for e in self.expenses if id(e) not in dropped_expenses]
+        dropped_incomes = self._incomes_by_recipient.pop(name, {})
+        if dropped_incomes:
+            self.incomes = [i for i in self.incomes if id(i) not in dropped_incomes]
+        self._balances.pop(name, None)
+        self._balances_version += 1
+        if self._autosave:
+            self.save()
 
-    def add_expense(self, date: str, desc: str, amount: float, payer: str, participants: List[str]):
+    def add_expense(self, date: str, desc: str, amount: float, payer: str, participants: Sequence[str]):
+        # nan/inf parse as floats but cannot round-trip through JSON (orjson writes null)
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number")
         if amount <= 0:
             raise ValueError("Amount must be positive")
-        if payer not in [p.name for p in self.people]:
+        if payer not in self._people_names:
             raise ValueError("Payer not found")
-        for part in participants:
-            if part not in [p.name for p in self.people]:
-                raise ValueError(f"Participant {part} not found")
-        self.expenses.append(Expense(date=date, description=desc, amount=amount, payer=payer, participants=participants))
-        self.save()
+        names = self._people_names
+        missing = [part for part in participants if part not in names]
+        if missing:
+            label = "Participant" if len(missing) == 1 else "Participants"
+            raise ValueError(f"{label} {', '.join(missing)} not found")
+        expense = Expense(date=date, description=desc, amount=amount, payer=payer,
+                          participants=self._intern_participants(participants))
+        self.expenses.append(expense)
+        self._index_expense(expense)
+        self._apply_expense(expense)
+        if self._autosave:
+            self.save()
 
     def remove_expense(self, index: int):
         if 0 <= index < len(self.expenses):
-            self.expenses.pop(index)
-            self.save()
+            expense = self.expenses.pop(index)
+            self._unindex_expense(expense)
+            for person in {expense.payer, *expense.participants}:
+                self._recompute_balance(person)
+            if self._autosave:
+                self.save()
 
     def add_income(self, date: str, desc: str, amount: float, recipient: str):
+        # nan/inf parse as floats but cannot round-trip through JSON (orjson writes null)
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number")
         if amount <= 0:
             raise ValueError("Amount must be positive")
-        if recipient not in [p.name for p in self.people]:
+        if recipient not in self._people_names:
             raise ValueError("Recipient not found")
-        self.incomes.append(Income(date=date, description=desc, amount=amount, recipient=recipient))
-        self.save()
+        income = Income(date=date, description=desc, amount=amount, recipient=recipient)
+        self.incomes.append(income)
+        self._index_income(income)
+        self._apply_income(income)
+        if self._autosave:
+            self.save()
 
     def remove_income(self, index: int):
         if 0 <= index < len(self.incomes):
-            self.incomes.pop(index)
-            self.save()
+            income = self.incomes.pop(index)
+            self._unindex_income(income)
+            self._recompute_balance(income.recipient)
+            if self._autosave:
+                self.save()
 
 # ---------------- Business logic -----------------
 def compute_balances(storage: Storage) -> Dict[str, float]:
-    # For each person: balance = paid - owes + income_received
-    balances: Dict[str, float] = {p.name: 0.0 for p in storage.people}
-
-    # Expenses
-    for e in storage.expenses:
-        num = len(e.participants)
-        if num == 0:
-            continue
-        share = e.amount / num
-        # each participant owes share
-        for part in e.participants:
-            balances[part] -= share
-        # payer paid full amount
-        balances[e.payer] += e.amount
-
-    # Incomes: add to recipient
-    for inc in storage.incomes:
-        balances[inc.recipient] += inc.amount
-
-    # Round to 2 decimals
-    for k in balances:
-        balances[k] = round(balances[k], 2)
-    return balances
+    # For each person: balance = paid - owes + income_received.
+    # Storage keeps the running totals up to date, so only rounding is left here;
+    # + 0.0 turns a rounded -0.0 into 0.0.
+    return {k: round(v, 2) + 0.0 for k, v in storage.balances().items()}
 
 # ---------------- GUI -----------------
 class App(tk.Tk):
@@ -155,6 +397,10 @@ class App(tk.Tk):
         self.resizable(True, True)
 
         self.storage = Storage()
+        # balances version the summary tree was last drawn for
+        self._summary_version = None
+        # people revision the people widgets were last filled for
+        self._last_people_rev = None
 
         self.create_widgets()
         self.refresh_all()
@@ -223,7 +469,8 @@ class App(tk.Tk):
             messagebox.showerror("Error", str(e))
             return
         self.person_name_var.set("")
-        self.refresh_all()
+        self.refresh_people()
+        self.refresh_summary()
 
     def remove_selected_person(self):
         sel = self.people_listbox.curselection()
@@ -241,10 +488,10 @@ class App(tk.Tk):
         if not path:
             return
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('name\n')
-                for p in self.storage.people:
-                    f.write(f'{p.name}\n')
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(['name'])
+                w.writerows([(p.name,) for p in self.storage.people])
             messagebox.showinfo('Export', 'People exported')
         except Exception as e:
             messagebox.showerror('Error', str(e))
@@ -306,7 +553,7 @@ class App(tk.Tk):
 
         try:
             # validate date
-            datetime.strptime(date, DATE_FORMAT)
+            parse_date(date)
         except Exception:
             messagebox.showerror('Error', 'Invalid date. Use YYYY-MM-DD')
             return
@@ -325,7 +572,9 @@ class App(tk.Tk):
             return
         self.exp_amount_var.set("")
         self.exp_desc_var.set("")
-        self.refresh_all()
+        # only the new tail row needs drawing
+        self.exp_tree.insert('', tk.END, values=self.expense_values(self.storage.expenses[-1]))
+        self.refresh_summary()
 
     def on_delete_expense(self, event):
         self.delete_selected_expense()
@@ -334,22 +583,24 @@ class App(tk.Tk):
         sel = self.exp_tree.selection()
         if not sel:
             return
-        idx = int(sel[0])
+        # row position in the tree matches the index in storage.expenses
+        idx = self.exp_tree.index(sel[0])
         if not messagebox.askyesno('Confirm', 'Delete selected expense?'):
             return
         self.storage.remove_expense(idx)
-        self.refresh_all()
+        self.exp_tree.delete(sel[0])
+        self.refresh_summary()
 
     def export_expenses_csv(self):
         path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV', '*.csv')])
         if not path:
             return
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('date,description,amount,payer,participants\n')
-                for e in self.storage.expenses:
-                    parts = ';'.join(e.participants)
-                    f.write(f'{e.date},{e.description},{e.amount},{e.payer},{parts}\n')
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(['date', 'description', 'amount', 'payer', 'participants'])
+                w.writerows([(e.date, e.description, e.amount, e.payer, ';'.join(e.participants))
+                             for e in self.storage.expenses])
             messagebox.showinfo('Export', 'Expenses exported')
         except Exception as exc:
             messagebox.showerror('Error', str(exc))
@@ -402,7 +653,7 @@ class App(tk.Tk):
         amt = self.inc_amount_var.get().strip()
         recipient = self.inc_recipient_cb.get().strip()
         try:
-            datetime.strptime(date, DATE_FORMAT)
+            parse_date(date)
         except Exception:
             messagebox.showerror('Error', 'Invalid date. Use YYYY-MM-DD')
             return
@@ -418,7 +669,8 @@ class App(tk.Tk):
             return
         self.inc_amount_var.set("")
         self.inc_desc_var.set("")
-        self.refresh_all()
+        self.inc_tree.insert('', tk.END, values=self.income_values(self.storage.incomes[-1]))
+        self.refresh_summary()
 
     def on_delete_income(self, event):
         self.delete_selected_income()
@@ -427,21 +679,22 @@ class App(tk.Tk):
         sel = self.inc_tree.selection()
         if not sel:
             return
-        idx = int(sel[0])
+        idx = self.inc_tree.index(sel[0])
         if not messagebox.askyesno('Confirm', 'Delete selected income?'):
             return
         self.storage.remove_income(idx)
-        self.refresh_all()
+        self.inc_tree.delete(sel[0])
+        self.refresh_summary()
 
     def export_incomes_csv(self):
         path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV', '*.csv')])
         if not path:
             return
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('date,description,amount,recipient\n')
-                for i in self.storage.incomes:
-                    f.write(f'{i.date},{i.description},{i.amount},{i.recipient}\n')
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(['date', 'description', 'amount', 'recipient'])
+                w.writerows([(i.date, i.description, i.amount, i.recipient) for i in self.storage.incomes])
             messagebox.showinfo('Export', 'Incomes exported')
         except Exception as exc:
             messagebox.showerror('Error', str(exc))
@@ -474,20 +727,28 @@ class App(tk.Tk):
             'incomes': [asdict(i) for i in self.storage.incomes]
         }
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            write_json(path, data, pretty=True)
             messagebox.showinfo('Saved', 'Snapshot saved')
         except Exception as e:
             messagebox.showerror('Error', str(e))
 
     # ---------- Refresh UI ----------
     def refresh_all(self):
+        self.refresh_people()
+        self.refresh_expenses()
+        self.refresh_incomes()
+        self.refresh_summary()
+
+    def refresh_people(self):
+        if self._last_people_rev == self.storage.people_rev:
+            return
+        self._last_people_rev = self.storage.people_rev
+        people_names = self.storage.names()
         # people
         self.people_listbox.delete(0, tk.END)
-        for p in self.storage.people:
-            self.people_listbox.insert(tk.END, p.name)
+        for name in people_names:
+            self.people_listbox.insert(tk.END, name)
         # comboboxes and listbox
-        people_names = [p.name for p in self.storage.people]
         self.exp_payer_cb['values'] = people_names
         self.inc_recipient_cb['values'] = people_names
 
@@ -496,28 +757,43 @@ class App(tk.Tk):
         for name in people_names:
             self.exp_participants_lb.insert(tk.END, name)
 
-        # expenses tree
-        for i in self.exp_tree.get_children():
-            self.exp_tree.delete(i)
-        for idx, e in enumerate(self.storage.expenses):
-            parts = ','.join(e.participants)
-            self.exp_tree.insert('', tk.END, iid=str(idx), values=(e.date, e.description, e.amount, e.payer, parts))
+    @staticmethod
+    def expense_values(e: Expense):
+        return (e.date, e.description, e.amount, e.payer, ','.join(e.participants))
 
-        # incomes tree
-        for i in self.inc_tree.get_children():
-            self.inc_tree.delete(i)
-        for idx, inc in enumerate(self.storage.incomes):
-            self.inc_tree.insert('', tk.END, iid=str(idx), values=(inc.date, inc.description, inc.amount, inc.recipient))
+    @staticmethod
+    def income_values(inc: Income):
+        return (inc.date, inc.description, inc.amount, inc.recipient)
 
-        self.refresh_summary()
+    # full rebuilds, only needed at startup and after remove_person
+    def refresh_expenses(self):
+        self.exp_tree.delete(*self.exp_tree.get_children())
+        for e in self.storage.expenses:
+            self.exp_tree.insert('', tk.END, values=self.expense_values(e))
+
+    def refresh_incomes(self):
+        self.inc_tree.delete(*self.inc_tree.get_children())
+        for inc in self.storage.incomes:
+            self.inc_tree.insert('', tk.END, values=self.income_values(inc))
 
     def refresh_summary(self):
+        if self._summary_version == self.storage.balances_version:
+            return
+        self._summary_version = self.storage.balances_version
         balances = compute_balances(self.storage)
-        for i in self.summary_tree.get_children():
-            self.summary_tree.delete(i)
+        tree = self.summary_tree
+        # rows are keyed by person name, so existing rows are updated in place
+        for iid in tree.get_children():
+            if iid not in balances:
+                tree.delete(iid)
         # show sorted by balance desc
-        for person, bal in sorted(balances.items(), key=lambda x: x[1], reverse=True):
-            self.summary_tree.insert('', tk.END, values=(person, f"{bal:.2f}"))
+        for pos, (person, bal) in enumerate(sorted(balances.items(), key=lambda x: x[1], reverse=True)):
+            values = (person, f"{bal:.2f}")
+            if tree.exists(person):
+                tree.item(person, values=values)
+                tree.move(person, '', pos)
+            else:
+                tree.insert('', pos, iid=person, values=values)
 
 # ---------------- Run -----------------
 if __name__ == '__main__':